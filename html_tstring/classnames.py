@@ -18,29 +18,37 @@ def classnames(*args: object) -> str:
     Returns:
         A single string with class names separated by spaces.
     """
+    # Fast path: the overwhelmingly common call is with plain strings only.
+    strings = [arg for arg in args if isinstance(arg, str)]
+    if len(strings) == len(args):
+        return " ".join(stripped for s in strings if (stripped := s.strip()))
+
     classes: list[str] = []
-    # Use a queue to process arguments iteratively, preserving order.
-    queue = list(args)
+    # Use a stack to process arguments iteratively. Items are pushed in
+    # reverse so that popping from the end (which is O(1), unlike popping
+    # from the front) still visits them in order.
+    stack = list(reversed(args))
 
-    while queue:
-        arg = queue.pop(0)
+    while stack:
+        arg = stack.pop()
 
         if not arg:  # Handles None, False, empty strings/lists/dicts
             continue
 
+        # Strip as we go so that the result can be joined directly.
         if isinstance(arg, str):
-            classes.append(arg)
+            if stripped := arg.strip():
+                classes.append(stripped)
         elif isinstance(arg, dict):
             for key, value in arg.items():
-                if value:
-                    classes.append(key)
+                if value and (stripped := key.strip()):
+                    classes.append(stripped)
         elif isinstance(arg, (list, tuple)):
-            # Add items to the front of the queue to process them next, in order.
-            queue[0:0] = arg
+            # Push items so that they are processed next, in order.
+            stack.extend(reversed(arg))
         elif isinstance(arg, bool):
             pass  # Explicitly ignore booleans not in a dict
         else:
             raise ValueError(f"Invalid class argument type: {type(arg).__name__}")
 
-    # Filter out empty strings and join the result.
-    return " ".join(stripped for c in classes if (stripped := c.strip()))
+    return " ".join(classes)
@@ -76,3 +76,15 @@ def test_classnames_kitchen_sink():
         )
         == "foo bar hello world cya"
     )
+
+
+def test_deeply_nested_lists():
+    nested: list[object] = ["deepest"]
+    for i in range(1000):
+        nested = [f"level-{i}", nested, {f"flag-{i}": i % 2 == 0}]
+    result = classnames(nested)
+    parts = result.split()
+    assert parts[0] == "level-999"
+    assert parts[-1] == "flag-998"
+    assert "deepest" in parts
+    assert len(parts) == 1000 + 1 + 500
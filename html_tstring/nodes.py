@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
+from functools import lru_cache
 
-from markupsafe import escape
+from markupsafe import Markup, escape
 
 # See https://developer.mozilla.org/en-US/docs/Glossary/Void_element
 VOID_ELEMENTS = frozenset(
@@ -27,6 +28,43 @@ CDATA_CONTENT_ELEMENTS = frozenset(["script", "style"])
 RCDATA_CONTENT_ELEMENTS = frozenset(["textarea", "title"])
 CONTENT_ELEMENTS = CDATA_CONTENT_ELEMENTS | RCDATA_CONTENT_ELEMENTS
 
+# Escaping the same short strings (class names, ids, labels) over and over is
+# common when rendering; we memoize those, but only up to a bounded size.
+_ESCAPE_CACHE_SIZE = 4096
+_ESCAPE_CACHE_MAX_LEN = 128
+
+
+@lru_cache(maxsize=_ESCAPE_CACHE_SIZE)
+def _cached_escape(value: str) -> Markup:
+    return escape(value)
+
+
+def _escape(value: str) -> Markup:
+    """Escape a value for HTML, memoizing the result for short plain strings."""
+    # Only plain strings are cached: Markup (and other __html__-bearing
+    # subclasses) compare equal to plain strings but must not be escaped.
+    if type(value) is str and len(value) <= _ESCAPE_CACHE_MAX_LEN:
+        return _cached_escape(value)
+    return escape(value)
+
+
+def _escape_for_render(value: str) -> str:
+    """Escape a value for HTML output, skipping plain strings that need none."""
+    # Most text has nothing to escape; a few C-level substring scans are much
+    # cheaper than escaping (and copying) the whole string. The result is only
+    # ever joined into rendered output, so it needn't be wrapped in Markup.
+    if (
+        type(value) is str
+        and "&" not in value
+        and "<" not in value
+        and ">" not in value
+        and '"' not in value
+        and "'" not in value
+    ):
+        return value
+    return _escape(value)
+
+
 # FUTURE: add a pretty-printer to nodes for debugging
 # FUTURE: make nodes frozen (and have the parser work with mutable builders)
 
@@ -45,7 +83,7 @@ class Text(Node):
 
     def __str__(self) -> str:
         # Use markupsafe's escape to handle HTML escaping
-        return escape(self.text)
+        return _escape(self.text)
 
 
 @dataclass(slots=True)
@@ -53,7 +91,7 @@ class Fragment(Node):
     children: list[Node] = field(default_factory=list)
 
     def __str__(self) -> str:
-        return "".join(str(child) for child in self.children)
+        return _render(self)
 
 
 @dataclass(slots=True)
@@ -96,23 +134,67 @@ class Element(Node):
         return self.tag in CONTENT_ELEMENTS
 
     def __str__(self) -> str:
-        # We use markupsafe's escape to handle HTML escaping of attribute values
-        # which means it's possible to mark them as safe if needed.
-        attrs_str = "".join(
-            f" {key}" if value is None else f' {key}="{escape(value)}"'
-            for key, value in self.attrs.items()
-        )
-        if self.is_void:
-            return f"<{self.tag}{attrs_str} />"
-        if not self.children:
-            return f"<{self.tag}{attrs_str}></{self.tag}>"
-        if self.is_content:
-            # Content elements should *not* escape their content when
-            # rendering to HTML. Sheesh, HTML is weird.
-            children_str = "".join(
-                child.text if isinstance(child, Text) else str(child)
-                for child in self.children
-            )
+        return _render(self)
+
+
+def _render(node: Node) -> str:
+    """
+    Render a Node tree to an HTML string.
+
+    The tree is walked with an explicit stack rather than by recursing through
+    each child's __str__(), so that every fragment of output is appended to a
+    single buffer that is joined exactly once. This also means that deeply
+    nested trees can't exhaust Python's recursion limit.
+    """
+    out: list[str] = []
+    # The stack holds nodes still to be rendered, as well as literal strings
+    # (closing tags, raw content element text) to be emitted as-is.
+    stack: list[Node | str] = [node]
+    while stack:
+        item = stack.pop()
+        # Text is by far the most common node, so check its exact type first.
+        # Element and Fragment subclasses are rendered inline too, unless they
+        # override __str__(), in which case they fall through to it below. The
+        # root is the exception: its own __str__() is what got us here.
+        if type(item) is Text:
+            out.append(_escape_for_render(item.text))
+        elif isinstance(item, str):
+            out.append(item)
+        elif isinstance(item, Element) and (
+            item is node or type(item).__str__ is Element.__str__
+        ):
+            tag = item.tag
+            out.append(f"<{tag}")
+            # Attribute fragments go straight into the output buffer. We use
+            # markupsafe's escape to handle HTML escaping of attribute values
+            # which means it's possible to mark them as safe if needed.
+            if attrs := item.attrs:
+                out.extend(
+                    f" {key}"
+                    if value is None
+                    else f' {key}="{_escape_for_render(value)}"'
+                    for key, value in attrs.items()
+                )
+            # Test the tag directly rather than going through the is_void and
+            # is_content properties; this loop runs once per element.
+            if tag in VOID_ELEMENTS:
+                out.append(" />")
+                continue
+            out.append(">")
+            stack.append(f"</{tag}>")
+            if tag in CONTENT_ELEMENTS:
+                # Content elements should *not* escape their content when
+                # rendering to HTML. Sheesh, HTML is weird.
+                stack.extend(
+                    child.text if isinstance(child, Text) else child
+                    for child in reversed(item.children)
+                )
+            else:
+                stack.extend(reversed(item.children))
+        elif isinstance(item, Fragment) and (
+            item is node or type(item).__str__ is Fragment.__str__
+        ):
+            stack.extend(reversed(item.children))
         else:
-            children_str = "".join(str(child) for child in self.children)
-        return f"<{self.tag}{attrs_str}>{children_str}</{self.tag}>"
+            out.append(str(item))
+    return "".join(out)
@@ -1,4 +1,5 @@
 import pytest
+from markupsafe import Markup
 
 from .nodes import Comment, DocumentType, Element, Fragment, Text
 
@@ -220,6 +221,15 @@ def test_complex_tree():
     )
 
 
+def test_deeply_nested_elements():
+    # Rendering must not be limited by Python's recursion limit.
+    depth = 5000
+    node = Text("deep")
+    for _ in range(depth):
+        node = Element("div", children=[node])
+    assert str(node) == "<div>" * depth + "deep" + "</div>" * depth
+
+
 def test_dunder_html_method():
     div = Element("div", children=[Text("Hello")])
     assert div.__html__() == str(div)
@@ -233,3 +243,59 @@ def test_escaping_of_text_content():
 def test_escaping_of_attribute_values():
     div = Element("div", attrs={"class": '">XSS<'})
     assert str(div) == '<div class="&#34;&gt;XSS&lt;"></div>'
+
+
+def test_escaping_does_not_confuse_markup_with_equal_plain_text():
+    assert str(Text("<b>bold</b>")) == "&lt;b&gt;bold&lt;/b&gt;"
+    assert str(Text(Markup("<b>bold</b>"))) == "<b>bold</b>"
+    assert str(Text("<b>bold</b>")) == "&lt;b&gt;bold&lt;/b&gt;"
+
+
+def test_escaping_quotes_without_other_special_characters():
+    assert str(Text('Say "hi" & it\'s done')) == "Say &#34;hi&#34; &amp; it&#39;s done"
+    assert str(Text('"quoted"')) == "&#34;quoted&#34;"
+    assert str(Element("p", attrs={"title": "it's"})) == '<p title="it&#39;s"></p>'
+
+
+def test_subclass_str_overrides_are_respected():
+    class CustomElement(Element):
+        def __str__(self) -> str:
+            return "<custom-rendered/>"
+
+    class CustomFragment(Fragment):
+        def __str__(self) -> str:
+            return "[fragment]"
+
+    class PlainSubclass(Element):
+        pass
+
+    node = Element(
+        "div",
+        children=[
+            CustomElement("span"),
+            CustomFragment(children=[Text("hidden")]),
+            PlainSubclass("em", children=[Text("inline")]),
+        ],
+    )
+    assert str(node) == "<div><custom-rendered/>[fragment]<em>inline</em></div>"
+    assert str(PlainSubclass("p", children=[Text("root")])) == "<p>root</p>"
+
+
+def test_deeply_nested_subclassed_elements():
+    # Subclasses that don't override __str__() render in the same single pass.
+    class Section(Element):
+        pass
+
+    depth = 5000
+    node = Text("deep")
+    for _ in range(depth):
+        node = Section("section", children=[Fragment(children=[node])])
+    assert str(node) == "<section>" * depth + "deep" + "</section>" * depth
+
+
+def test_text_str_is_markup():
+    # str() of a Text is escaped output, so it must stay Markup even when there
+    # was nothing to escape; otherwise concatenation would skip escaping.
+    assert isinstance(str(Text("hi")), Markup)
+    assert str(Text("hi")) + "<i>" == Markup("hi&lt;i&gt;")
+    assert isinstance(str(Text("a < b")), Markup)
@@ -1,3 +1,4 @@
+import sys
 import typing as t
 from html.parser import HTMLParser
 
@@ -16,7 +17,13 @@ class NodeParser(HTMLParser):
     def handle_starttag(
         self, tag: str, attrs: t.Sequence[tuple[str, str | None]]
     ) -> None:
-        element = Element(tag, attrs=dict(attrs), children=[])
+        # Tag and attribute names repeat heavily across templates; interning
+        # them lets set and dict lookups on them short-circuit on identity.
+        element = Element(
+            sys.intern(tag),
+            attrs={sys.intern(k): v for k, v in attrs},
+            children=[],
+        )
         self.stack.append(element)
 
         # Unfortunately, Python's built-in HTMLParser has inconsistent behavior
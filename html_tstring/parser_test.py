@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 
 from .nodes import Comment, DocumentType, Element, Fragment, Text
@@ -59,6 +61,14 @@ def test_parse_element_with_attributes():
     )
 
 
+def test_parse_interns_tag_and_attribute_names():
+    node = parse_html('<custom-el data-thing="x"></custom-el>')
+    assert isinstance(node, Element)
+    assert node.tag is sys.intern("custom-el")
+    (key,) = node.attrs
+    assert key is sys.intern("data-thing")
+
+
 def test_parse_comment():
     node = parse_html("<!-- This is a comment -->")
     assert node == Comment(" This is a comment ")
@@ -2,18 +2,18 @@ import random
 import string
 import typing as t
 from collections.abc import Iterable
+from dataclasses import dataclass
 from functools import lru_cache
 from string.templatelib import Interpolation, Template
 
 from markupsafe import Markup
 
 from .classnames import classnames
-from .nodes import Element, Fragment, Node, Text
+from .nodes import Comment, DocumentType, Element, Fragment, Node, Text
 from .parser import parse_html
 from .utils import format_interpolation as base_format_interpolation
 
 
-@t.runtime_checkable
 class HasHTMLDunder(t.Protocol):
     def __html__(self) -> str: ...
 
@@ -53,14 +53,23 @@ _PLACEHOLDER_PREFIX = f"t🐍-{''.join(random.choices(string.ascii_lowercase, k=
 _PP_LEN = len(_PLACEHOLDER_PREFIX)
 
 
+# Every placeholder we've generated, mapped back to its index. There is one
+# entry per interpolation position ever used, so this stays small.
+_PLACEHOLDER_INDICES: dict[str, int] = {}
+
+
 def _placeholder(i: int) -> str:
     """Generate a placeholder for the i-th interpolation."""
-    return f"{_PLACEHOLDER_PREFIX}{i}"
+    placeholder = f"{_PLACEHOLDER_PREFIX}{i}"
+    _PLACEHOLDER_INDICES[placeholder] = i
+    return placeholder
 
 
 def _placholder_index(s: str) -> int:
     """Extract the index from a placeholder string."""
-    return int(s[_PP_LEN:])
+    # A dict lookup is about twice as fast as slicing and parsing the index.
+    index = _PLACEHOLDER_INDICES.get(s)
+    return int(s[_PP_LEN:]) if index is None else index
 
 
 def _instrument(
@@ -95,17 +104,85 @@ def _instrument(
             yield placeholder
 
 
-@lru_cache()
+# The number of distinct parsed templates to keep around. Each distinct
+# t-string literal in an application (and each distinct set of component
+# callables it is invoked with) occupies one entry.
+_PARSE_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class _ParsedTemplate:
+    """The cached result of instrumenting and parsing a template."""
+
+    node: Node
+    """The parsed tree of Nodes, with placeholders where interpolations go."""
+
+    dynamic: frozenset[int]
+    """The ids of nodes in the tree whose subtree contains a placeholder."""
+
+    dynamic_attrs: frozenset[int]
+    """The ids of Elements in the tree whose own attributes contain a placeholder."""
+
+
+def _find_dynamic(root: Node) -> tuple[frozenset[int], frozenset[int]]:
+    """
+    Find the placeholders in a parsed tree.
+
+    Returns the ids of all nodes whose subtree contains a placeholder, and the
+    ids of all Elements whose attributes contain one.
+    """
+    dynamic: set[int] = set()
+    dynamic_attrs: set[int] = set()
+    visited: list[tuple[Node, Node | None]] = []
+    stack: list[tuple[Node, Node | None]] = [(root, None)]
+    while stack:
+        node, parent = stack.pop()
+        visited.append((node, parent))
+        match node:
+            case Text(text):
+                if _PLACEHOLDER_PREFIX in text:
+                    dynamic.add(id(node))
+            case Element(tag=tag, attrs=attrs, children=children):
+                if any(
+                    _PLACEHOLDER_PREFIX in key
+                    or (value is not None and _PLACEHOLDER_PREFIX in value)
+                    for key, value in attrs.items()
+                ):
+                    dynamic_attrs.add(id(node))
+                    dynamic.add(id(node))
+                elif _PLACEHOLDER_PREFIX in tag:
+                    dynamic.add(id(node))
+                stack.extend((child, node) for child in children)
+            case Fragment(children=children):
+                stack.extend((child, node) for child in children)
+            case _:
+                pass
+    # Children are always visited after their parent, so walking the visit
+    # order backwards propagates each mark up through all of its ancestors.
+    for node, parent in reversed(visited):
+        if parent is not None and id(node) in dynamic:
+            dynamic.add(id(parent))
+    return frozenset(dynamic), frozenset(dynamic_attrs)
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
 def _instrument_and_parse_internal(
     strings: tuple[str, ...], callable_ids: tuple[int | None, ...]
-) -> Node:
+) -> _ParsedTemplate:
     """
     Instrument the strings and parse the resulting HTML.
 
     The result is cached to avoid re-parsing the same template multiple times.
+    The cache is bounded so that applications which generate many distinct
+    templates don't grow memory without limit.
+
+    Alongside the tree, we record which of its nodes contain placeholders so
+    that substitution can copy placeholder-free subtrees without inspecting
+    them.
     """
     instrumented = _instrument(strings, callable_ids)
-    return parse_html(instrumented)
+    node = parse_html(instrumented)
+    return _ParsedTemplate(node, *_find_dynamic(node))
 
 
 def _callable_id(value: object) -> int | None:
@@ -113,7 +190,7 @@ def _callable_id(value: object) -> int | None:
     return id(value) if callable(value) else None
 
 
-def _instrument_and_parse(template: Template) -> Node:
+def _instrument_and_parse(template: Template) -> _ParsedTemplate:
     """Instrument and parse a template, returning a tree of Nodes."""
     # This is a thin wrapper around the cached internal function that does the
     # actual work. This exists to handle the syntax we've settled on for
@@ -138,6 +215,9 @@ def _instrument_and_parse(template: Template) -> Node:
 
 def _force_dict(value: t.Any, *, kind: str) -> dict:
     """Try to convert a value to a dict, raising TypeError if not possible."""
+    # Callers only ever read the result, so a dict needn't be copied.
+    if type(value) is dict:
+        return value
     try:
         return dict(value)
     except (TypeError, ValueError):
@@ -179,7 +259,7 @@ def _substitute_style_attr(value: object) -> t.Iterable[tuple[str, str | None]]:
     """Substitute a style attribute based on the interpolated value."""
     try:
         d = _force_dict(value, kind="style")
-        style_str = "; ".join(f"{k}: {v}" for k, v in d.items())
+        style_str = "; ".join([f"{k}: {v}" for k, v in d.items()])
         yield ("style", style_str)
     except TypeError:
         yield ("style", str(value))
@@ -246,35 +326,29 @@ def _substitute_attrs(
     for key, value in attrs.items():
         if value and value.startswith(_PLACEHOLDER_PREFIX):
             index = _placholder_index(value)
-            interpolation = interpolations[index]
-            value = format_interpolation(interpolation)
-            for sub_k, sub_v in _substitute_attr(key, value):
-                new_attrs[sub_k] = sub_v
+            # dict.update() consumes the (key, value) pairs in C; later keys
+            # win, just as they do in a spread.
+            new_attrs.update(
+                _substitute_attr(key, format_interpolation(interpolations[index]))
+            )
         elif key.startswith(_PLACEHOLDER_PREFIX):
             index = _placholder_index(key)
-            interpolation = interpolations[index]
-            value = format_interpolation(interpolation)
-            for sub_k, sub_v in _substitute_spread_attrs(value):
-                new_attrs[sub_k] = sub_v
+            new_attrs.update(
+                _substitute_spread_attrs(format_interpolation(interpolations[index]))
+            )
         else:
             new_attrs[key] = value
     return new_attrs
 
 
-def _substitute_and_flatten_children(
-    children: t.Iterable[Node], interpolations: tuple[Interpolation, ...]
-) -> list[Node]:
-    """Substitute placeholders in a list of children and flatten any fragments."""
-    new_children: list[Node] = []
-    for child in children:
-        substituted = _substitute_node(child, interpolations)
-        if isinstance(substituted, Fragment):
-            # This can happen if an interpolation results in a Fragment, for
-            # instance if it is iterable.
-            new_children.extend(substituted.children)
-        else:
-            new_children.append(substituted)
-    return new_children
+def _append_flattened(children: list[Node], node: Node) -> None:
+    """Append a substituted child to a list of children, flattening fragments."""
+    if isinstance(node, Fragment):
+        # This can happen if an interpolation results in a Fragment, for
+        # instance if it is iterable.
+        children.extend(node.children)
+    else:
+        children.append(node)
 
 
 def _node_from_value(value: object) -> Node:
@@ -284,6 +358,13 @@ def _node_from_value(value: object) -> Node:
     This is the primary substitution performed when replacing interpolations
     in child content positions.
     """
+    # Exact strings and numbers are by far the most common values; handle them
+    # before the match below, whose abstract Iterable check is comparatively
+    # slow. Subclasses (including Markup) still go through the match.
+    if type(value) is str:
+        return Text(value)
+    if type(value) is int or type(value) is float:
+        return Text(str(value))
     match value:
         case str():
             return Text(value)
@@ -294,11 +375,17 @@ def _node_from_value(value: object) -> Node:
         case False:
             return Text("")
         case Iterable():
-            children = [_node_from_value(v) for v in value]
+            # Splice nested iterables into a single flat Fragment up front,
+            # rather than leaving Fragment chains for the renderer to walk.
+            children: list[Node] = []
+            for v in value:
+                _append_flattened(children, _node_from_value(v))
             return Fragment(children=children)
-        case HasHTMLDunder():
+        case _ if (dunder := getattr(value, "__html__", None)) is not None:
+            # A plain attribute fetch, as markupsafe does; a runtime-checkable
+            # Protocol isinstance() check is far slower.
             # CONSIDER: could we return a lazy Text?
-            return Text(Markup(value.__html__()))
+            return Text(Markup(dunder()))
         case _:
             # CONSIDER: could we return a lazy Text?
             return Text(str(value))
@@ -310,14 +397,13 @@ type ComponentCallable = t.Callable[..., ComponentReturn | t.Iterable[ComponentR
 
 def _invoke_component(
     tag: str,
-    new_attrs: dict[str, object | None],
+    new_attrs: t.Mapping[str, object | None],
     new_children: list[Node],
     interpolations: tuple[Interpolation, ...],
 ) -> Node:
     """Substitute a component invocation based on the corresponding interpolations."""
     index = _placholder_index(tag)
-    interpolation = interpolations[index]
-    value = format_interpolation(interpolation)
+    value = format_interpolation(interpolations[index])
     # TODO: consider use of signature() or other approaches to validation.
     if not callable(value):
         raise TypeError(
@@ -335,8 +421,8 @@ def _invoke_component(
             return html(result)
         case str():
             return Text(result)
-        case HasHTMLDunder():
-            return Text(Markup(result.__html__()))
+        case _ if (dunder := getattr(result, "__html__", None)) is not None:
+            return Text(Markup(dunder()))
         case _:
             raise TypeError(
                 f"Component callable must return a Node, Template, or str; "
@@ -344,32 +430,145 @@ def _invoke_component(
             )
 
 
-def _stringify_attrs(attrs: dict[str, object | None]) -> dict[str, str | None]:
+def _stringify_attrs(attrs: t.Mapping[str, object | None]) -> dict[str, str | None]:
     """Convert all attribute values to strings, preserving None values."""
     return {k: str(v) if v is not None else None for k, v in attrs.items()}
 
 
-def _substitute_node(p_node: Node, interpolations: tuple[Interpolation, ...]) -> Node:
-    """Substitute placeholders in a node based on the corresponding interpolations."""
-    match p_node:
-        case Text(text) if str(text).startswith(_PLACEHOLDER_PREFIX):
-            index = _placholder_index(str(text))
-            interpolation = interpolations[index]
-            value = format_interpolation(interpolation)
-            return _node_from_value(value)
-        case Element(tag=tag, attrs=attrs, children=children):
-            new_attrs = _substitute_attrs(attrs, interpolations)
-            new_children = _substitute_and_flatten_children(children, interpolations)
-            if tag.startswith(_PLACEHOLDER_PREFIX):
-                return _invoke_component(tag, new_attrs, new_children, interpolations)
+def _copy_static(p_node: Node) -> Node:
+    """
+    Copy a parsed subtree that contains no placeholders.
+
+    Nodes are mutable, so parsed nodes must never leave the parse cache
+    themselves; this is a plain structural copy, with none of the placeholder
+    checks that substitution does.
+    """
+    copies: list[Node] = []
+    # Each entry pairs a list of parsed children with the list their copies go
+    # into; leaves are copied in place, so only containers are ever pushed.
+    stack: list[tuple[list[Node], list[Node]]] = [([p_node], copies)]
+    while stack:
+        children, new_children = stack.pop()
+        for child in children:
+            # Parsed trees only ever contain these five exact node types.
+            if type(child) is Text:
+                new_children.append(Text(child.text))
+            elif type(child) is Element:
+                element = Element(child.tag, dict(child.attrs))
+                new_children.append(element)
+                if child.children:
+                    stack.append((child.children, element.children))
+            elif type(child) is Fragment:
+                fragment = Fragment()
+                new_children.append(fragment)
+                stack.append((child.children, fragment.children))
+            elif type(child) is Comment:
+                new_children.append(Comment(child.text))
+            elif type(child) is DocumentType:
+                new_children.append(DocumentType(child.text))
+    return copies[0]
+
+
+def _substitute_leaf(p_node: Node, interpolations: tuple[Interpolation, ...]) -> Node:
+    """Substitute placeholders in a node that has no children to walk."""
+    # Only leaves in the dynamic set get here, so this is almost always a
+    # placeholder Text; check that directly rather than through a match.
+    if type(p_node) is Text and p_node.text.startswith(_PLACEHOLDER_PREFIX):
+        index = _placholder_index(p_node.text)
+        return _node_from_value(format_interpolation(interpolations[index]))
+    return _copy_static(p_node)
+
+
+type _Frame = tuple[
+    Element | Fragment, t.Iterator[Node], list[Node], t.Mapping[str, object | None]
+]
+"""
+A container node being substituted: the parsed node, an iterator over its
+parsed children, its substituted children so far, and its substituted attrs.
+"""
+
+
+def _open_frame(
+    container: Element | Fragment,
+    interpolations: tuple[Interpolation, ...],
+    dynamic_attrs: frozenset[int],
+) -> _Frame:
+    """Start substituting a container node, beginning with its attributes."""
+    new_attrs: t.Mapping[str, object | None]
+    if isinstance(container, Fragment):
+        new_attrs = {}
+    elif id(container) in dynamic_attrs:
+        new_attrs = _substitute_attrs(container.attrs, interpolations)
+    else:
+        # Nothing to substitute; skip straight to the end. The parsed attrs are
+        # copied when the Element is closed.
+        new_attrs = container.attrs
+    return (container, iter(container.children), [], new_attrs)
+
+
+def _close_frame(
+    container: Element | Fragment,
+    new_children: list[Node],
+    new_attrs: t.Mapping[str, object | None],
+    interpolations: tuple[Interpolation, ...],
+) -> Node:
+    """Finish substituting a container node once all its children are done."""
+    if isinstance(container, Fragment):
+        return Fragment(children=new_children)
+    tag = container.tag
+    if tag.startswith(_PLACEHOLDER_PREFIX):
+        return _invoke_component(tag, new_attrs, new_children, interpolations)
+    # Static attrs are already strings and only need copying, so that the
+    # cached dict is never handed out.
+    attrs = (
+        dict(container.attrs)
+        if new_attrs is container.attrs
+        else _stringify_attrs(new_attrs)
+    )
+    return Element(tag=tag, attrs=attrs, children=new_children)
+
+
+def _substitute_node(
+    p_node: Node,
+    interpolations: tuple[Interpolation, ...],
+    dynamic: frozenset[int],
+    dynamic_attrs: frozenset[int],
+) -> Node:
+    """
+    Substitute placeholders in a node based on the corresponding interpolations.
+
+    Subtrees that contain no placeholders at all (those whose ids are not in
+    `dynamic`) are simply copied, without being inspected. Likewise, Elements
+    whose attributes contain no placeholders (those whose ids are not in
+    `dynamic_attrs`) get a plain copy of their parsed attrs.
+
+    The tree is walked with an explicit stack of frames rather than by
+    recursion, so deeply nested templates don't pay for a Python call per
+    level or run into the recursion limit.
+    """
+    if id(p_node) not in dynamic:
+        return _copy_static(p_node)
+    if not isinstance(p_node, (Element, Fragment)):
+        return _substitute_leaf(p_node, interpolations)
+
+    stack = [_open_frame(p_node, interpolations, dynamic_attrs)]
+    while True:
+        container, children, new_children, new_attrs = stack[-1]
+        for child in children:
+            if id(child) not in dynamic:
+                _append_flattened(new_children, _copy_static(child))
+            elif isinstance(child, (Element, Fragment)):
+                # Descend; we'll resume this frame's iterator afterwards.
+                stack.append(_open_frame(child, interpolations, dynamic_attrs))
+                break
             else:
-                new_attrs = _stringify_attrs(new_attrs)
-                return Element(tag=tag, attrs=new_attrs, children=new_children)
-        case Fragment(children=children):
-            new_children = _substitute_and_flatten_children(children, interpolations)
-            return Fragment(children=new_children)
-        case _:
-            return p_node
+                _append_flattened(new_children, _substitute_leaf(child, interpolations))
+        else:
+            _ = stack.pop()
+            node = _close_frame(container, new_children, new_attrs, interpolations)
+            if not stack:
+                return node
+            _append_flattened(stack[-1][2], node)
 
 
 # --------------------------------------------------------------------------
@@ -381,5 +580,7 @@ def html(template: Template) -> Node:
     """Parse a t-string and return a tree of Nodes."""
     # Parse the HTML, returning a tree of nodes with placeholders
     # where interpolations go.
-    p_node = _instrument_and_parse(template)
-    return _substitute_node(p_node, template.interpolations)
+    parsed = _instrument_and_parse(template)
+    return _substitute_node(
+        parsed.node, template.interpolations, parsed.dynamic, parsed.dynamic_attrs
+    )
@@ -1,11 +1,11 @@
 import typing as t
-from string.templatelib import Template
+from string.templatelib import Interpolation, Template
 
 import pytest
 from markupsafe import Markup
 
 from .nodes import Element, Fragment, Node, Text
-from .processor import ComponentCallable, html
+from .processor import ComponentCallable, _instrument_and_parse_internal, html
 
 # --------------------------------------------------------------------------
 # Basic HTML parsing tests
@@ -86,6 +86,72 @@ def test_parse_nested_elements():
     assert str(node) == "<div><p>Hello</p><p>World</p></div>"
 
 
+def test_parse_is_cached_across_calls():
+    def greet(name: str) -> Node:
+        return html(t"<p>Hello, {name}!</p>")
+
+    _ = greet("Alice")
+    hits = _instrument_and_parse_internal.cache_info().hits
+    node = greet("Bob")
+    assert _instrument_and_parse_internal.cache_info().hits == hits + 1
+    assert str(node) == "<p>Hello, Bob!</p>"
+
+
+def test_static_subtrees_across_calls():
+    def page(name: str) -> Node:
+        return html(t'<div><nav><a href="/">Home</a></nav><p>{name}</p></div>')
+
+    first, second = page("Alice"), page("Bob")
+    assert isinstance(first, Element) and isinstance(second, Element)
+    assert first.children[0] == second.children[0]
+    assert first.children[1] != second.children[1]
+    assert str(first) == '<div><nav><a href="/">Home</a></nav><p>Alice</p></div>'
+    assert str(second) == '<div><nav><a href="/">Home</a></nav><p>Bob</p></div>'
+
+
+def test_mutating_a_static_result_does_not_affect_later_calls():
+    def banner() -> Node:
+        return html(t'<header class="banner"><h1>Welcome</h1></header>')
+
+    first = banner()
+    assert isinstance(first, Element)
+    first.attrs["class"] = "hacked"
+    first.children.clear()
+    assert str(banner()) == '<header class="banner"><h1>Welcome</h1></header>'
+
+
+@pytest.mark.parametrize("dynamic", [False, True])
+def test_components_may_mutate_their_children(dynamic: bool):
+    def Card(*children: Node) -> Node:
+        for child in children:
+            if isinstance(child, Element):
+                child.attrs["class"] = f"{child.attrs.get('class')} card-item"
+        return Fragment(children=list(children))
+
+    for _ in range(3):
+        if dynamic:
+            node = html(t'<{Card}><p class="item">{"Item"}</p></{Card}>')
+        else:
+            node = html(t'<{Card}><p class="item">Item</p></{Card}>')
+        assert str(node) == '<p class="item card-item">Item</p>'
+
+
+def test_static_attrs_across_calls():
+    def card(title: str, kind: str) -> Node:
+        return html(t'<div class="card"><h2 class={kind}>{title}</h2></div>')
+
+    first, second = card("One", "big"), card("Two", "small")
+    assert isinstance(first, Element) and isinstance(second, Element)
+    assert first.attrs == second.attrs
+    assert first.children[0] != second.children[0]
+    assert str(first) == '<div class="card"><h2 class="big">One</h2></div>'
+    assert str(second) == '<div class="card"><h2 class="small">Two</h2></div>'
+
+    first.attrs["id"] = "first"
+    third = card("Three", "big")
+    assert str(third) == '<div class="card"><h2 class="big">Three</h2></div>'
+
+
 # --------------------------------------------------------------------------
 # Interpolated text content
 # --------------------------------------------------------------------------
@@ -129,6 +195,35 @@ def test_conversions():
     )
 
 
+def test_unused_interpolations_are_not_formatted():
+    # The placeholder inside the comment never reaches substitution, so its
+    # (invalid for a str) format spec is never applied.
+    x = "not a number"
+    node = html(t"<p>hi</p><!-- {x:.2f} -->")
+    assert str(node).startswith("<p>hi</p><!--")
+
+
+def test_interpolations_are_formatted_in_template_order():
+    log: list[object] = []
+
+    class Logged:
+        def __init__(self, n: int):
+            self.n = n
+
+        def __format__(self, format_spec: str) -> str:
+            log.append(self.n)
+            return str(self.n)
+
+    def Component() -> Template:
+        log.append("comp")
+        return t"<b>comp</b>"
+
+    first, second = Logged(1), Logged(2)
+    node = html(t"<p>{first:x}</p><{Component} /><p>{second:x}</p>")
+    assert str(node) == "<p>1</p><b>comp</b><p>2</p>"
+    assert log == [1, "comp", 2]
+
+
 # --------------------------------------------------------------------------
 # Raw HTML injection tests
 # --------------------------------------------------------------------------
@@ -259,6 +354,12 @@ def test_interpolated_nonstring_content():
     assert str(node) == "<p>The answer is 42.</p>"
 
 
+def test_interpolated_falsy_numbers_are_rendered():
+    zero, nothing = 0, 0.0
+    node = html(t"<p>{zero} and {nothing}</p>")
+    assert str(node) == "<p>0 and 0.0</p>"
+
+
 def test_list_items():
     items = ["Apple", "Banana", "Cherry"]
     node = html(t"<ul>{[t'<li>{item}</li>' for item in items]}</ul>")
@@ -273,6 +374,30 @@ def test_list_items():
     assert str(node) == "<ul><li>Apple</li><li>Banana</li><li>Cherry</li></ul>"
 
 
+def test_deeply_nested_interpolation():
+    # Substitution must not be limited by Python's recursion limit.
+    depth = 2000
+    template = Template(
+        "<div>" * depth, Interpolation("deep", "deep"), "</div>" * depth
+    )
+    node = html(template)
+    assert str(node) == "<div>" * depth + "deep" + "</div>" * depth
+
+
+def test_nested_iterables_are_flattened():
+    items = [["apple", "banana"], (t"<b>{'cherry'}</b>",), []]
+    node = html(t"<p>{items}</p>")
+    assert node == Element(
+        "p",
+        children=[
+            Text("apple"),
+            Text("banana"),
+            Element("b", children=[Text("cherry")]),
+        ],
+    )
+    assert str(node) == "<p>applebanana<b>cherry</b></p>"
+
+
 def test_nested_list_items():
     # TODO XXX this is a pretty abusrd test case; clean it up when refactoring
     outer = ["fruit", "more fruit"]